@@ -1,13 +1,35 @@
 import logging
 import numpy as np
 import pandas as pd
+from scipy import sparse
 import os
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import MinMaxScaler
-from typing import List, Optional
+import hashlib
+from functools import lru_cache
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from typing import Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, fields
 from datetime import datetime
 from dotenv import load_dotenv
+from joblib import Parallel, delayed
+
+try:
+    import faiss
+except ImportError:  # Optional: only needed for SIMILARITY_BACKEND=faiss
+    faiss = None
+
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:  # Optional: enables the streaming (single-threaded) CSV reader
+    pyarrow = None
+
+try:
+    import cupy as cp
+    import cupyx.scipy.sparse as cp_sparse
+except ImportError:  # Optional: only needed for SIMILARITY_BACKEND=cupy
+    cp = None
+    cp_sparse = None
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -15,7 +37,12 @@ load_dotenv()
 
 class Config:
     DATA_SOURCE = os.getenv("DATA_SOURCE", "movies.csv")
+    CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "10000"))
     LOGGING_LEVEL = os.getenv("LOGGING_LEVEL", "INFO")
+    FEATURE_CACHE = os.getenv("FEATURE_CACHE", "features.npz")
+    SIMILARITY_BACKEND = os.getenv("SIMILARITY_BACKEND", "sparse")
+    PRECOMPUTE_NEIGHBORS = os.getenv("PRECOMPUTE_NEIGHBORS", "false").lower() == "true"
+    GPU_MIN_MOVIES = int(os.getenv("GPU_MIN_MOVIES", "100000"))
 
 
 # Configure logging
@@ -37,6 +64,124 @@ def clean_text(text: str) -> str:
     return ' '.join(str(text).split())
 
 
+def clean_text_column(column: pd.Series) -> np.ndarray:
+    """
+    Applies `clean_text` to every value of a DataFrame column.
+
+    Args:
+        column (pd.Series): Text column that may contain NaN values.
+
+    Returns:
+        np.ndarray: Object array of cleaned strings, with NaN replaced by ''.
+    """
+    return np.array([clean_text(text) for text in column], dtype=object)
+
+
+# Bump whenever the layout or meaning of the cached feature matrix changes.
+FEATURE_CACHE_VERSION = 3
+
+# Ways of scoring queries against the catalog, selected via Config.SIMILARITY_BACKEND.
+SIMILARITY_BACKENDS = ('sparse', 'faiss', 'cupy')
+
+# CSV columns used to build movies and the dtypes they are parsed as; all
+# other columns are skipped while parsing. Text columns are pinned to str, so
+# a chunk of numeric-looking titles (e.g. '1917') is not read as integers.
+# vote_count is parsed as a float so that missing values and counts written
+# as '123.0' are accepted; it is cast to int32 once missing values are filled.
+CSV_COLUMNS = [
+    'original_title', 'genres', 'keywords', 'production_companies', 'popularity',
+    'release_date', 'runtime', 'cast', 'vote_count', 'vote_average'
+]
+CSV_DTYPES = {
+    'original_title': 'str',
+    'genres': 'str',
+    'keywords': 'str',
+    'production_companies': 'str',
+    'release_date': 'str',
+    'cast': 'str',
+    'popularity': 'float32',
+    'runtime': 'float32',
+    'vote_count': 'float32',
+    'vote_average': 'float32',
+}
+
+# Strings both CSV readers treat as missing, so they yield the same values;
+# this is the list pandas' CSV reader uses by default.
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# Bytes of CSV text the pyarrow reader parses per streamed block.
+CSV_BLOCK_SIZE = 1 << 20
+
+# Largest query block, in matrix entries, that is scored with dense query rows.
+DENSE_QUERY_MAX_VALUES = 1 << 20
+
+# Number of distinct titles whose recommendations are kept in memory.
+RECOMMENDATION_CACHE_SIZE = 1024
+
+# Token prefixes for the genres, keywords and cast fields, in that order.
+TEXT_FIELD_PREFIXES = ('g:', 'k:', 'c:')
+
+
+def tokenize_fields(field_texts: Tuple[str, str, str]) -> List[str]:
+    """
+    Splits the genres, keywords and cast of a movie into '|'-separated tokens,
+    each prefixed with its field so they can share a single vocabulary.
+
+    Args:
+        field_texts (Tuple[str, str, str]): Genres, keywords and cast of one movie.
+
+    Returns:
+        List[str]: Lowercased, prefixed tokens without English stop words.
+    """
+    return [
+        prefix + token
+        for prefix, text in zip(TEXT_FIELD_PREFIXES, field_texts)
+        for token in text.lower().split('|')
+        if token not in ENGLISH_STOP_WORDS
+    ]
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Finds the indices of the k highest scores along the last axis without
+    sorting the whole array.
+
+    Args:
+        scores (np.ndarray): Array of scores, one row per query for 2D input.
+        k (int): Number of indices to return.
+
+    Returns:
+        np.ndarray: Indices of the k highest scores, highest first.
+    """
+    k = min(k, scores.shape[-1])
+    if k == 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+
+def min_max_scale(features: np.ndarray) -> np.ndarray:
+    """
+    Scales each column to [0, 1] in place, like sklearn's MinMaxScaler but
+    without copying the array. Constant columns become 0.
+
+    Args:
+        features (np.ndarray): 2D float array, modified in place.
+
+    Returns:
+        np.ndarray: The same array, scaled.
+    """
+    # After the shift, the column maximum is its range.
+    features -= features.min(axis=0)
+    features /= np.maximum(features.max(axis=0), 1e-12)
+    return features
+
+
 class Movie:
     """
     Represents a movie object with various attributes such as title, genres, etc.
@@ -47,25 +192,39 @@ class Movie:
         keywords (str): Keywords describing the movie.
         companies (str): Production companies.
         popularity (float): Popularity score of the movie.
-        release_date (str): Movie's release date.
+        release_date (pd.Timestamp): Movie's release date.
+        release_year (int): Movie's release year.
         runtime (float): Runtime of the movie.
         cast (str): Main cast members.
         vote_count (int): Number of votes.
         vote_average (float): Average vote rating.
+
+    If `release_year` is given, `release_date` is taken to be already parsed
+    and is stored as is; otherwise it is parsed here.
     """
-    
+
+    __slots__ = (
+        'title', 'genres', 'keywords', 'companies', 'popularity', 'release_date',
+        'release_year', 'runtime', 'cast', 'vote_count', 'vote_average'
+    )
+
     def __init__(
         self, title: str, genres: str, keywords: str, companies: str,
-        popularity: float, release_date: str, runtime: float,
-        cast: str, vote_count: int, vote_average: float
+        popularity: float, release_date: Union[str, pd.Timestamp], runtime: float,
+        cast: str, vote_count: int, vote_average: float,
+        release_year: Optional[int] = None
     ):
         self.title = title
         self.genres = genres
         self.keywords = keywords
         self.companies = companies
         self.popularity = popularity
-        self.release_date = pd.to_datetime(release_date)
-        self.release_year = self.release_date.year
+        if release_year is None:
+            self.release_date = pd.to_datetime(release_date)
+            self.release_year = self.release_date.year
+        else:
+            self.release_date = release_date
+            self.release_year = release_year
         self.runtime = runtime
         self.cast = cast
         self.vote_count = vote_count
@@ -75,115 +234,504 @@ class Movie:
         return f"Movie('{self.title}')"
 
 
+@dataclass
+class MovieCatalog:
+    """
+    Columnar store of movie attributes, one NumPy array per attribute.
+
+    Attributes:
+        titles (np.ndarray): Movie titles.
+        genres (np.ndarray): Genres associated with each movie.
+        keywords (np.ndarray): Keywords describing each movie.
+        companies (np.ndarray): Production companies.
+        cast (np.ndarray): Main cast members.
+        release_year (np.ndarray): Release year of each movie.
+        runtime (np.ndarray): Runtime of each movie.
+        popularity (np.ndarray): Popularity score of each movie.
+        vote_average (np.ndarray): Average vote rating.
+        vote_count (np.ndarray): Number of votes.
+    """
+
+    titles: np.ndarray
+    genres: np.ndarray
+    keywords: np.ndarray
+    companies: np.ndarray
+    cast: np.ndarray
+    release_year: np.ndarray
+    runtime: np.ndarray
+    popularity: np.ndarray
+    vote_average: np.ndarray
+    vote_count: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @classmethod
+    def from_movies(cls, movies: List[Movie]) -> "MovieCatalog":
+        """
+        Builds a catalog from a list of Movie objects.
+
+        Args:
+            movies (List[Movie]): Movies to store column-wise.
+
+        Returns:
+            MovieCatalog: Catalog holding the attributes of the given movies.
+        """
+        return cls(
+            titles=np.array([movie.title for movie in movies], dtype=object),
+            genres=np.array([movie.genres for movie in movies], dtype=object),
+            keywords=np.array([movie.keywords for movie in movies], dtype=object),
+            companies=np.array([movie.companies for movie in movies], dtype=object),
+            cast=np.array([movie.cast for movie in movies], dtype=object),
+            release_year=np.array([movie.release_year for movie in movies], dtype=np.int64),
+            runtime=np.array([movie.runtime for movie in movies], dtype=np.float64),
+            popularity=np.array([movie.popularity for movie in movies], dtype=np.float64),
+            vote_average=np.array([movie.vote_average for movie in movies], dtype=np.float64),
+            vote_count=np.array([movie.vote_count for movie in movies], dtype=np.float64),
+        )
+
+
 class DatabaseInterface:
     """
     Handles loading and processing movie data from a CSV file.
 
+    The file is parsed in chunks, so only one chunk of raw rows is held in
+    memory next to the movies built so far.
+
     Attributes:
         data_source (str): Path to the CSV file.
+        chunk_size (int): Number of rows parsed at a time by the pandas reader;
+            the pyarrow reader streams in blocks of CSV_BLOCK_SIZE bytes instead.
         movies (List[Movie]): A list of Movie objects created from the data.
+        catalog (Optional[MovieCatalog]): Columnar view of the data, if loaded.
     """
 
-    def __init__(self, data_source: str = Config.DATA_SOURCE):
+    def __init__(self, data_source: str = Config.DATA_SOURCE, chunk_size: int = Config.CSV_CHUNK_SIZE):
         self.data_source = data_source
+        self.chunk_size = chunk_size
         self.movies: List[Movie] = []
+        self.catalog: Optional[MovieCatalog] = None
 
-    def load_data(self) -> List[Movie]:
+    def _read_chunks(self) -> Iterator[pd.DataFrame]:
         """
-        Loads movie data from the CSV file and initializes Movie objects.
+        Reads the columns used for movies from the CSV file chunk by chunk,
+        streaming through pyarrow when it is installed.
 
-        Returns:
-            List[Movie]: A list of Movie objects created from the CSV file.
+        Yields:
+            pd.DataFrame: The unprocessed movie data of one chunk.
 
         Raises:
             FileNotFoundError: If the CSV file does not exist.
-            Exception: If any other error occurs during loading or processing.
+            KeyError: If the CSV file lacks any of the CSV_COLUMNS.
+            Exception: If the CSV file cannot be parsed.
         """
         if not os.path.exists(self.data_source):
             logging.error(f"File {self.data_source} does not exist.")
             raise FileNotFoundError(f"File {self.data_source} not found.")
-        
+
+        # Columns are selected while parsing, so check the header here to
+        # report missing columns the same way for both readers.
         try:
-            df = pd.read_csv(self.data_source)
+            header = pd.read_csv(self.data_source, nrows=0).columns
         except Exception as e:
             logging.error(f"Error loading CSV: {e}")
             raise
+        missing_columns = [name for name in CSV_COLUMNS if name not in header]
+        if missing_columns:
+            logging.error(f"Missing expected column in data: {missing_columns}")
+            raise KeyError(f"Missing expected columns: {', '.join(missing_columns)}")
 
         try:
-            self.movies = [
-                Movie(
-                    title=row['original_title'],
-                    genres=clean_text(row['genres']),
-                    keywords=clean_text(row['keywords']),
-                    companies=clean_text(row['production_companies']),
-                    popularity=row['popularity'] if pd.notna(row['popularity']) else 0.0,
-                    release_date=row['release_date'] if pd.notna(row['release_date']) else '1900-01-01',
-                    runtime=row['runtime'] if pd.notna(row['runtime']) else 0.0,
-                    cast=clean_text(row['cast']),
-                    vote_count=row['vote_count'] if pd.notna(row['vote_count']) else 0,
-                    vote_average=row['vote_average'] if pd.notna(row['vote_average']) else 0.0
+            if pyarrow is not None:
+                # Fix every column type up front; otherwise each block's types
+                # would be inferred from the first block alone.
+                column_types = {
+                    name: pyarrow.type_for_alias(CSV_DTYPES[name])
+                    for name in CSV_COLUMNS
+                }
+                reader = pyarrow.csv.open_csv(
+                    self.data_source,
+                    read_options=pyarrow.csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                    # Quoted fields (e.g. overview) may span lines; without this
+                    # pyarrow splits blocks mid-record and fails to parse.
+                    parse_options=pyarrow.csv.ParseOptions(newlines_in_values=True),
+                    # Treat CSV_NA_VALUES as missing in text columns too.
+                    convert_options=pyarrow.csv.ConvertOptions(
+                        include_columns=CSV_COLUMNS, column_types=column_types,
+                        null_values=CSV_NA_VALUES, strings_can_be_null=True
+                    )
+                )
+                for batch in reader:
+                    yield batch.to_pandas()
+            else:
+                yield from pd.read_csv(
+                    self.data_source, usecols=CSV_COLUMNS, dtype=CSV_DTYPES, chunksize=self.chunk_size,
+                    na_values=CSV_NA_VALUES, keep_default_na=False
                 )
-                for _, row in df.iterrows()
-            ]
-            logging.info(f"Successfully loaded {len(self.movies)} movies.")
-        except KeyError as e:
-            logging.error(f"Missing expected column in data: {e}")
-            raise
         except Exception as e:
-            logging.error(f"Error processing data: {e}")
+            logging.error(f"Error loading CSV: {e}")
             raise
 
+    def fingerprint(self) -> str:
+        """
+        Identifies the current version of the CSV file from its path, size and
+        modification time, without reading its contents.
+
+        Returns:
+            str: Hex digest that changes whenever the file is modified.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+        """
+        if not os.path.exists(self.data_source):
+            logging.error(f"File {self.data_source} does not exist.")
+            raise FileNotFoundError(f"File {self.data_source} not found.")
+
+        stat = os.stat(self.data_source)
+        key = f"{os.path.abspath(self.data_source)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def _extract_columns(df: pd.DataFrame, with_release_date: bool = False) -> dict:
+        """
+        Pulls every movie attribute out of the DataFrame as a cleaned NumPy array.
+
+        Args:
+            df (pd.DataFrame): Raw movie data.
+            with_release_date (bool): Whether to include the release dates as an
+                object array of Timestamps; only Movie objects need them.
+
+        Returns:
+            dict: Arrays keyed by Movie constructor argument, with the same
+            dtypes whichever CSV parser produced the DataFrame.
+        """
+        # Parse all release dates in one vectorized pass; missing or malformed
+        # dates fall back to 1900-01-01.
+        release_dates = pd.to_datetime(
+            df['release_date'], format='%Y-%m-%d', errors='coerce'
+        ).fillna(pd.Timestamp('1900-01-01'))
+
+        columns = {
+            # Missing titles become '' rather than NaN, so they survive the
+            # string-typed feature cache unchanged.
+            'title': df['original_title'].fillna('').to_numpy(dtype=object),
+            'genres': clean_text_column(df['genres']),
+            'keywords': clean_text_column(df['keywords']),
+            'companies': clean_text_column(df['production_companies']),
+            'popularity': df['popularity'].fillna(0.0).to_numpy(dtype=np.float32),
+            'runtime': df['runtime'].fillna(0.0).to_numpy(dtype=np.float32),
+            'cast': clean_text_column(df['cast']),
+            'vote_count': df['vote_count'].fillna(0).to_numpy(dtype=np.int32),
+            'vote_average': df['vote_average'].fillna(0.0).to_numpy(dtype=np.float32),
+            'release_year': release_dates.dt.year.to_numpy(dtype=np.int32),
+        }
+        if with_release_date:
+            # Boxes every date in its own Timestamp, so it is skipped for catalogs.
+            columns['release_date'] = release_dates.astype(object).to_numpy()
+        return columns
+
+    def _iter_columns(self, with_release_date: bool = False) -> Iterator[dict]:
+        """
+        Yields the cleaned movie columns of the CSV file one chunk at a time.
+
+        Args:
+            with_release_date (bool): Whether to include the release dates.
+
+        Yields:
+            dict: Arrays keyed by Movie constructor argument, see `_extract_columns`.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+            KeyError: If the CSV file lacks an expected column.
+            Exception: If any other error occurs during loading or processing.
+        """
+        for df in self._read_chunks():
+            try:
+                columns = self._extract_columns(df, with_release_date)
+            except Exception as e:
+                logging.error(f"Error processing data: {e}")
+                raise
+            yield columns
+
+    def load_data(self) -> List[Movie]:
+        """
+        Loads movie data from the CSV file and initializes Movie objects.
+
+        Returns:
+            List[Movie]: A list of Movie objects created from the CSV file.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+            KeyError: If the CSV file lacks an expected column.
+            Exception: If any other error occurs during loading or processing.
+        """
+        self.movies = []
+        for columns in self._iter_columns(with_release_date=True):
+            self.movies.extend(
+                Movie(
+                    title=title, genres=genres, keywords=keywords, companies=companies,
+                    popularity=popularity, release_date=release_date, runtime=runtime,
+                    cast=cast, vote_count=vote_count, vote_average=vote_average,
+                    release_year=release_year
+                )
+                for title, genres, keywords, companies, popularity, release_date, runtime,
+                cast, vote_count, vote_average, release_year in zip(
+                    columns['title'], columns['genres'], columns['keywords'], columns['companies'],
+                    columns['popularity'], columns['release_date'], columns['runtime'],
+                    columns['cast'], columns['vote_count'], columns['vote_average'],
+                    columns['release_year']
+                )
+            )
+        logging.info(f"Successfully loaded {len(self.movies)} movies.")
+
         return self.movies
 
+    def load_catalog(self) -> MovieCatalog:
+        """
+        Loads movie data from the CSV file into a columnar MovieCatalog,
+        without creating a Movie object per row.
+
+        Returns:
+            MovieCatalog: Catalog holding one array per movie attribute.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist.
+            KeyError: If the CSV file lacks an expected column.
+            Exception: If any other error occurs during loading or processing.
+        """
+        chunks = list(self._iter_columns())
+        if not chunks:
+            self.catalog = MovieCatalog.from_movies([])
+        else:
+            def concatenate(name: str) -> np.ndarray:
+                return np.concatenate([chunk[name] for chunk in chunks])
+
+            self.catalog = MovieCatalog(
+                titles=concatenate('title'),
+                genres=concatenate('genres'),
+                keywords=concatenate('keywords'),
+                companies=concatenate('companies'),
+                cast=concatenate('cast'),
+                release_year=concatenate('release_year'),
+                runtime=concatenate('runtime'),
+                popularity=concatenate('popularity'),
+                vote_average=concatenate('vote_average'),
+                vote_count=concatenate('vote_count'),
+            )
+        logging.info(f"Successfully loaded {len(self.catalog)} movies.")
+
+        return self.catalog
+
 
 class MovieRecommender:
     """
     Movie recommender system that calculates similarity between movies.
 
     Attributes:
-        movies (List[Movie]): List of Movie objects.
-        feature_matrix (Optional[np.ndarray]): Matrix of movie features.
+        movies (MovieCatalog): Columnar store of the movies to recommend from.
+        feature_matrix (Optional[sparse.csr_matrix]): Sparse float32 matrix of L2-normalized movie features.
         movie_indices (dict): Dictionary mapping movie titles to their indices.
+        vectorizer (Optional[TfidfVectorizer]): Fitted vectorizer for the text fields.
+        backend (str): How queries are scored, one of SIMILARITY_BACKENDS.
+        index (Optional[faiss.Index]): FAISS index over the feature rows, if in use.
+        feature_matrix_gpu (Optional[cupyx.scipy.sparse.csr_matrix]): Copy of the
+            feature matrix in GPU memory, if in use.
+        neighbors (Optional[np.ndarray]): Precomputed recommendation indices per movie.
     """
 
-    def __init__(self, movies: List[Movie]):
+    def __init__(
+        self, movies: Union[List[Movie], MovieCatalog],
+        backend: str = Config.SIMILARITY_BACKEND
+    ):
+        if backend not in SIMILARITY_BACKENDS:
+            raise ValueError(f"Unknown similarity backend '{backend}', expected one of {SIMILARITY_BACKENDS}.")
+        if not isinstance(movies, MovieCatalog):
+            movies = MovieCatalog.from_movies(movies)
         self.movies = movies
-        self.feature_matrix: Optional[np.ndarray] = None
-        self.movie_indices: dict = {movie.title: i for i, movie in enumerate(self.movies)}
+        self.backend = backend
+        self.feature_matrix: Optional[sparse.csr_matrix] = None
+        self.vectorizer: Optional[TfidfVectorizer] = None
+        self.index = None
+        self.feature_matrix_gpu = None
+        self.neighbors: Optional[np.ndarray] = None
+        # Per-instance cache, so it is dropped together with the recommender.
+        self._cached_similarity = lru_cache(maxsize=RECOMMENDATION_CACHE_SIZE)(self._similar_titles)
+        self.movie_indices: dict = dict(zip(self.movies.titles.tolist(), range(len(self.movies))))
 
     def feature_engineering(self):
         """
-        Creates a feature matrix using TF-IDF for text fields and normalizes
-        continuous fields.
+        Creates a sparse feature matrix using TF-IDF for text fields and
+        normalizes continuous fields. Each row is scaled to unit length.
         """
-        vectorizer = TfidfVectorizer(tokenizer=lambda x: x.split('|'), stop_words='english', token_pattern=None)
+        # One vectorizer over all three text fields; tokens are prefixed per field so
+        # the vocabularies stay apart, and each field block is normalized on its own.
+        vectorizer = TfidfVectorizer(analyzer=tokenize_fields, norm=None, dtype=np.float32)
+        tfidf_matrix = vectorizer.fit_transform(
+            list(zip(self.movies.genres, self.movies.keywords, self.movies.cast))
+        )
+        feature_names = vectorizer.get_feature_names_out().astype(str)
+        text_blocks = [
+            normalize(tfidf_matrix[:, np.char.startswith(feature_names, prefix)])
+            for prefix in TEXT_FIELD_PREFIXES
+        ]
+
+        continuous_features = min_max_scale(self._continuous_features(datetime.now().year))
+
+        self.feature_matrix = sparse.hstack(
+            text_blocks + [sparse.csr_matrix(continuous_features, dtype=np.float32)],
+            format='csr'
+        ).astype(np.float32, copy=False)
+        # Rows are L2-normalized once here, so a plain dot product between two
+        # rows is their cosine similarity.
+        normalize(self.feature_matrix, norm='l2', copy=False)
+        self.vectorizer = vectorizer
+        self.neighbors = None
+        self._cached_similarity.cache_clear()
+        self._build_index()
+
+    def _continuous_features(self, current_year: int) -> np.ndarray:
+        """
+        Fills a preallocated array with the raw continuous features of every
+        movie: age, runtime, popularity, vote average and log vote count.
 
-        genres_matrix = vectorizer.fit_transform([movie.genres for movie in self.movies])
-        keywords_matrix = vectorizer.fit_transform([movie.keywords for movie in self.movies])
-        cast_matrix = vectorizer.fit_transform([movie.cast for movie in self.movies])
+        Args:
+            current_year (int): Year the movie age is measured from.
 
-        combined_features = np.hstack(
-            [genres_matrix.toarray(), keywords_matrix.toarray(), cast_matrix.toarray()]
-        )
+        Returns:
+            np.ndarray: Array of shape (number of movies, 5).
+        """
+        features = np.empty((len(self.movies), 5), dtype=np.float32)
+        np.subtract(current_year, self.movies.release_year, out=features[:, 0], casting='unsafe')
+        features[:, 1] = self.movies.runtime
+        features[:, 2] = self.movies.popularity
+        features[:, 3] = self.movies.vote_average
+        np.log1p(self.movies.vote_count, out=features[:, 4], casting='unsafe')
+        return features
+
+    def _build_index(self):
+        """
+        Prepares the structures needed by the selected similarity backend:
+        a FAISS inner-product index over the normalized feature rows for
+        'faiss', or a GPU copy of the feature matrix for 'cupy'. The FAISS
+        index stores the rows densely, so it is meant for catalogs whose
+        vocabulary keeps that affordable; the GPU only pays off for large
+        catalogs, so smaller ones stay on the CPU.
+        """
+        self.index = None
+        self.feature_matrix_gpu = None
+        if self.backend == 'cupy':
+            if cp is None:
+                logging.warning("The 'cupy' backend requires the cupy package; using sparse products instead.")
+            elif len(self.movies) < Config.GPU_MIN_MOVIES:
+                logging.info(
+                    f"Catalog has fewer than {Config.GPU_MIN_MOVIES} movies; using sparse products on the CPU."
+                )
+            else:
+                self.feature_matrix_gpu = cp_sparse.csr_matrix(self.feature_matrix)
+            return
+
+        if self.backend != 'faiss':
+            return
+        if faiss is None:
+            logging.warning("The 'faiss' backend requires the faiss package; using sparse products instead.")
+            return
+
+        dense_features = np.ascontiguousarray(self.feature_matrix.toarray(), dtype=np.float32)
+        self.index = faiss.IndexFlatIP(dense_features.shape[1])
+        self.index.add(dense_features)
+
+    def save_features(self, path: str, key: str):
+        """
+        Writes the catalog, feature matrix and fitted vocabulary to an .npz file,
+        so later runs can skip parsing the CSV and fitting TF-IDF.
+
+        Args:
+            path (str): Destination of the cache file.
+            key (str): Fingerprint of the data source the features were built from.
+        """
+        if self.feature_matrix is None:
+            self.feature_engineering()
+
+        columns = {}
+        for field in fields(MovieCatalog):
+            column = getattr(self.movies, field.name)
+            columns[f"catalog_{field.name}"] = column.astype(str) if column.dtype == object else column
+
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    version=FEATURE_CACHE_VERSION,
+                    key=key,
+                    data=self.feature_matrix.data,
+                    indices=self.feature_matrix.indices,
+                    indptr=self.feature_matrix.indptr,
+                    shape=self.feature_matrix.shape,
+                    vocabulary=self.vectorizer.get_feature_names_out().astype(str),
+                    idf=self.vectorizer.idf_,
+                    **columns
+                )
+            os.replace(temp_path, path)
+            logging.info(f"Saved feature cache to {path}.")
+        except OSError as e:
+            logging.warning(f"Could not write feature cache {path}: {e}")
+        finally:
+            # Drop a partially written file; after os.replace it is gone already.
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @classmethod
+    def load_features(
+        cls, path: str, key: str, backend: str = Config.SIMILARITY_BACKEND
+    ) -> Optional["MovieRecommender"]:
+        """
+        Restores a recommender from a cache written by `save_features`.
+
+        Args:
+            path (str): Location of the cache file.
+            key (str): Fingerprint of the current data source.
+            backend (str): Similarity backend of the restored recommender.
+
+        Returns:
+            Optional[MovieRecommender]: The restored recommender, or None if the
+            cache is missing, unreadable or was built from different data.
+        """
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path) as cached:
+                if int(cached['version']) != FEATURE_CACHE_VERSION or str(cached['key']) != key:
+                    logging.info(f"Feature cache {path} is stale, rebuilding features.")
+                    return None
+
+                columns = {}
+                for field in fields(MovieCatalog):
+                    column = cached[f"catalog_{field.name}"]
+                    columns[field.name] = column.astype(object) if column.dtype.kind == 'U' else column
+
+                recommender = cls(MovieCatalog(**columns), backend=backend)
+                recommender.feature_matrix = sparse.csr_matrix(
+                    (cached['data'], cached['indices'], cached['indptr']),
+                    shape=tuple(cached['shape'])
+                )
+                vectorizer = TfidfVectorizer(analyzer=tokenize_fields, norm=None, dtype=np.float32)
+                vectorizer.vocabulary_ = {term: i for i, term in enumerate(cached['vocabulary'].tolist())}
+                vectorizer.idf_ = cached['idf']
+                recommender.vectorizer = vectorizer
+            recommender._build_index()
+        except Exception as e:
+            logging.warning(f"Could not read feature cache {path}: {e}")
+            return None
 
-        current_year = datetime.now().year
-        scaler = MinMaxScaler()
-        continuous_features = scaler.fit_transform(np.array([
-            [
-                (current_year - movie.release_year),
-                movie.runtime,
-                movie.popularity,
-                movie.vote_average,
-                np.log1p(movie.vote_count)
-            ]
-            for movie in self.movies
-        ]))
-
-        self.feature_matrix = np.hstack([combined_features, continuous_features])
+        logging.info(f"Loaded {len(recommender.movies)} movies from feature cache {path}.")
+        return recommender
 
     def calculate_similarity(self, target_movie_title: str) -> List[str]:
         """
         Calculates the similarity of the target movie with other movies.
+        Results are cached per title, so repeated queries are not recomputed.
 
         Args:
             target_movie_title (str): The title of the movie to compare.
@@ -194,20 +742,122 @@ class MovieRecommender:
         Raises:
             ValueError: If the movie is not found in the database.
         """
+        return list(self._cached_similarity(target_movie_title))
+
+    def _similar_titles(self, target_movie_title: str) -> Tuple[str, ...]:
+        """Uncached body of `calculate_similarity`, returning an immutable result."""
+        return tuple(self.calculate_similarity_batch([target_movie_title])[0])
+
+    def calculate_similarity_batch(self, target_movie_titles: List[str]) -> List[List[str]]:
+        """
+        Calculates recommendations for several movies at once, scoring all of
+        them against the catalog in a single matrix product.
+
+        Args:
+            target_movie_titles (List[str]): The titles of the movies to compare.
+
+        Returns:
+            List[List[str]]: Recommended movie titles for each target, in order.
+
+        Raises:
+            ValueError: If any of the movies is not found in the database.
+        """
         if self.feature_matrix is None:
             self.feature_engineering()
 
-        target_idx = self.movie_indices.get(target_movie_title)
-        if target_idx is None:
-            logging.error(f"Movie '{target_movie_title}' not found.")
-            raise ValueError(f"Movie '{target_movie_title}' not found in the database.")
+        target_indices = []
+        for title in target_movie_titles:
+            target_idx = self.movie_indices.get(title)
+            if target_idx is None:
+                logging.error(f"Movie '{title}' not found.")
+                raise ValueError(f"Movie '{title}' not found in the database.")
+            target_indices.append(target_idx)
+
+        if self.neighbors is not None:
+            nearest = self.neighbors[target_indices]
+        else:
+            nearest = self._nearest_neighbors(np.array(target_indices, dtype=np.intp))
+
+        recommendations = []
+        for title, most_similar_indices in zip(target_movie_titles, nearest):
+            titles = self.movies.titles[most_similar_indices].tolist()
+            logging.info(f"Recommendations for '{title}': {titles}")
+            recommendations.append(titles)
+        return recommendations
 
-        similarity_scores = cosine_similarity([self.feature_matrix[target_idx]], self.feature_matrix)[0]
+    def precompute_neighbors(self, block_size: int = 256, n_jobs: int = -1):
+        """
+        Computes the recommendations of every movie up front, scoring blocks of
+        rows in parallel, so later queries become table lookups.
 
-        most_similar_indices = similarity_scores.argsort()[::-1][1:6]  # Exclude the target movie itself
-        recommendations = [self.movies[i].title for i in most_similar_indices]
-        logging.info(f"Recommendations for '{target_movie_title}': {recommendations}")
-        return recommendations
+        Args:
+            block_size (int): Number of movies scored per block; bounds the size
+                of each dense block of scores.
+            n_jobs (int): Number of parallel workers, -1 for one per CPU.
+        """
+        if self.feature_matrix is None:
+            self.feature_engineering()
+
+        n_movies = len(self.movies)
+        blocks = [
+            np.arange(start, min(start + block_size, n_movies))
+            for start in range(0, n_movies, block_size)
+        ]
+        # Threads share the feature matrix; the sparse products and FAISS
+        # searches release the GIL while they run.
+        results = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self._nearest_neighbors)(block) for block in blocks
+        )
+        self.neighbors = np.vstack(results).astype(np.int32) if results else None
+        logging.info(f"Precomputed recommendations for {n_movies} movies.")
+
+    def _nearest_neighbors(self, target_indices: np.ndarray) -> np.ndarray:
+        """
+        Finds the five most similar movies for each target movie.
+
+        Args:
+            target_indices (np.ndarray): Indices of the target movies.
+
+        Returns:
+            np.ndarray: Indices of the most similar movies, one row per target,
+            most similar first and never including the target itself.
+        """
+        queries = self.feature_matrix[target_indices]
+        n_features = self.feature_matrix.shape[1]
+        # Small query blocks are densified so the product runs sparse-times-dense
+        # straight into the dense score array. Large ones, such as the blocks of
+        # precompute_neighbors, stay sparse to bound the memory of each worker.
+        dense_queries = len(target_indices) * n_features <= DENSE_QUERY_MAX_VALUES
+        if self.index is not None:
+            n_neighbors = min(6, self.index.ntotal)
+            if dense_queries:
+                _, nearest = self.index.search(queries.toarray(), n_neighbors)
+            else:
+                # FAISS only takes dense queries, so large blocks are searched in slices.
+                step = max(1, DENSE_QUERY_MAX_VALUES // n_features)
+                nearest = np.vstack([
+                    self.index.search(queries[start:start + step].toarray(), n_neighbors)[1]
+                    for start in range(0, len(target_indices), step)
+                ])
+        elif self.feature_matrix_gpu is not None:
+            if dense_queries:
+                similarity_scores = (self.feature_matrix_gpu @ cp.asarray(queries.toarray()).T).T
+            else:
+                similarity_scores = (cp_sparse.csr_matrix(queries) @ self.feature_matrix_gpu.T).toarray()
+            nearest = top_k_indices(cp.asnumpy(similarity_scores), 6)
+        else:
+            if dense_queries:
+                similarity_scores = (self.feature_matrix @ queries.toarray().T).T
+            else:
+                similarity_scores = (queries @ self.feature_matrix.T).toarray()
+            nearest = top_k_indices(similarity_scores, 6)
+
+        # Exclude the target movie itself, moving it to the end of its row
+        # while keeping the order of the others.
+        is_target = nearest == target_indices[:, None]
+        order = np.argsort(is_target, axis=1, kind='stable')
+        n_recommendations = min(5, len(self.movies) - 1)
+        return np.take_along_axis(nearest, order, axis=1)[:, :n_recommendations]
 
 
 class Interface:
@@ -269,7 +919,12 @@ class Interface:
 
 if __name__ == "__main__":
     db = DatabaseInterface()
-    movies = db.load_data()
-    recommender = MovieRecommender(movies)
+    cache_key = db.fingerprint()
+    recommender = MovieRecommender.load_features(Config.FEATURE_CACHE, cache_key)
+    if recommender is None:
+        recommender = MovieRecommender(db.load_catalog())
+        recommender.save_features(Config.FEATURE_CACHE, cache_key)
+    if Config.PRECOMPUTE_NEIGHBORS:
+        recommender.precompute_neighbors()
     interface = Interface(recommender)
     interface.run()
@@ -0,0 +1,12 @@
+import pytest
+import main
+
+
+@pytest.fixture(params=["pyarrow", "pandas"])
+def csv_reader(request, monkeypatch):
+    """Runs a test once with each CSV reader, skipping pyarrow if it is not installed."""
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(main, "pyarrow", None)
+    return request.param
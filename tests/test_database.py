@@ -1,6 +1,9 @@
+import dataclasses
 import pytest
 from unittest.mock import patch, mock_open
-from main import DatabaseInterface, Movie
+import main
+from main import DatabaseInterface, Movie, MovieRecommender, clean_text, clean_text_column
+import numpy as np
 import pandas as pd
 
 def test_load_data_with_real_csv():
@@ -10,4 +13,147 @@ def test_load_data_with_real_csv():
 
     assert len(movies) > 0  # Ensure movies are loaded from the actual CSV
     assert isinstance(movies[0], Movie)
-    assert movies[0].title == "Avatar"
\ No newline at end of file
+    assert movies[0].title == "Avatar"
+
+
+def test_load_in_chunks(tmp_path, monkeypatch, csv_reader):
+    """Test that chunked loading keeps every row, in order."""
+    monkeypatch.setattr(main, "CSV_BLOCK_SIZE", 256)
+
+    csv_path = tmp_path / "movies.csv"
+    pd.DataFrame({
+        "original_title": ["Inception", "The Matrix", "The Godfather"],
+        "genres": ["Action|Adventure", "Action|Sci-Fi", None],
+        "keywords": ["Dream|Spy", "Hacker|Future", "Mafia|Family"],
+        "production_companies": ["Warner Bros", "Warner Bros", "Paramount Pictures"],
+        "popularity": [9.8, 9.5, 9.2],
+        "release_date": ["2010-07-16", "1999-03-31", None],
+        "runtime": [148, 136, 175],
+        "cast": ["Leonardo DiCaprio", "Keanu Reeves", "Marlon Brando"],
+        "vote_count": [20000, None, 12000],
+        "vote_average": [8.8, 8.7, 9.2],
+        "overview": ["", "", ""],
+    }).to_csv(csv_path, index=False)
+    assert csv_path.stat().st_size > 256  # Spans several pyarrow blocks
+    db = DatabaseInterface(data_source=str(csv_path), chunk_size=2)
+
+    movies = db.load_data()
+    assert [movie.title for movie in movies] == ["Inception", "The Matrix", "The Godfather"]
+    assert movies[2].genres == ""
+    assert movies[2].release_year == 1900
+    assert movies[0].release_date == pd.Timestamp("2010-07-16")
+
+    catalog = db.load_catalog()
+    assert list(catalog.titles) == ["Inception", "The Matrix", "The Godfather"]
+    assert list(catalog.vote_count) == [20000, 0, 12000]
+
+
+def test_load_multiline_values_across_blocks(tmp_path, monkeypatch, csv_reader):
+    """Test that quoted fields spanning lines survive block and chunk boundaries."""
+    monkeypatch.setattr(main, "CSV_BLOCK_SIZE", 1024)
+
+    n_movies = 200
+    csv_path = tmp_path / "movies.csv"
+    pd.DataFrame({
+        "original_title": [f"Movie {i}" for i in range(n_movies)],
+        "genres": "Action|Drama",
+        "keywords": "Dream|Spy",
+        "production_companies": "Warner Bros",
+        "popularity": 9.8,
+        "release_date": "2010-07-16",
+        "runtime": 148,
+        "cast": "Leonardo\nDiCaprio",
+        "vote_count": 20000,
+        "vote_average": 8.8,
+        "overview": 'A thief who steals secrets,\nthrough "dream-sharing"\ntechnology.',
+    }).to_csv(csv_path, index=False)
+    assert csv_path.stat().st_size > 10 * 1024
+
+    catalog = DatabaseInterface(data_source=str(csv_path), chunk_size=7).load_catalog()
+    assert list(catalog.titles) == [f"Movie {i}" for i in range(n_movies)]
+    assert catalog.cast[-1] == "Leonardo DiCaprio"
+
+
+def test_load_numeric_titles_in_chunks(tmp_path, csv_reader):
+    """Test that a chunk of numeric-looking titles still loads them as strings."""
+    csv_path = tmp_path / "movies.csv"
+    pd.DataFrame({
+        "original_title": ["Inception", "The Matrix", "1917", "300"],
+        "genres": ["Action|Adventure", "Action|Sci-Fi", "War|Drama", "Action|War"],
+        "keywords": ["Dream|Spy", "Hacker|Future", "Trench|Soldier", "Sparta|Battle"],
+        "production_companies": ["Warner Bros", "Warner Bros", "Universal Pictures", "Warner Bros"],
+        "popularity": [9.8, 9.5, 8.1, 7.4],
+        "release_date": ["2010-07-16", "1999-03-31", "2019-12-25", "2006-12-09"],
+        "runtime": [148, 136, 119, 117],
+        "cast": ["Leonardo DiCaprio", "Keanu Reeves", "George MacKay", "Gerard Butler"],
+        "vote_count": [20000, 15000, 9000, 8000],
+        "vote_average": [8.8, 8.7, 8.3, 7.6],
+    }).to_csv(csv_path, index=False)
+    db = DatabaseInterface(data_source=str(csv_path), chunk_size=2)
+
+    assert [movie.title for movie in db.load_data()] == ["Inception", "The Matrix", "1917", "300"]
+    catalog = db.load_catalog()
+    assert catalog.titles.tolist() == ["Inception", "The Matrix", "1917", "300"]
+    assert MovieRecommender(catalog).calculate_similarity("1917")
+
+
+def test_load_missing_column(tmp_path, csv_reader):
+    """Test that a missing column raises KeyError whichever reader is used."""
+    csv_path = tmp_path / "movies.csv"
+    pd.DataFrame({"original_title": ["Inception"], "genres": ["Action"]}).to_csv(csv_path, index=False)
+    db = DatabaseInterface(data_source=str(csv_path))
+
+    with pytest.raises(KeyError):
+        db.load_data()
+    with pytest.raises(KeyError):
+        db.load_catalog()
+
+
+def test_load_missing_values(tmp_path, csv_reader):
+    """Test that NA-like strings and empty cells load the same with either reader."""
+    csv_path = tmp_path / "movies.csv"
+    csv_path.write_text(
+        "original_title,genres,keywords,production_companies,popularity,release_date,runtime,cast,vote_count,vote_average\n"
+        "Inception,Action|Adventure,Dream|Spy,Warner Bros,9.8,2010-07-16,148,Leonardo DiCaprio,20000,8.8\n"
+        ",NA,null,None,NaN,N/A,,nan,,#N/A\n"
+    )
+    catalog = DatabaseInterface(data_source=str(csv_path)).load_catalog()
+
+    assert catalog.titles.tolist() == ["Inception", ""]
+    assert catalog.genres.tolist() == ["Action|Adventure", ""]
+    assert catalog.keywords.tolist() == ["Dream|Spy", ""]
+    assert catalog.companies.tolist() == ["Warner Bros", ""]
+    assert catalog.cast.tolist() == ["Leonardo DiCaprio", ""]
+    assert catalog.release_year.tolist() == [2010, 1900]
+    assert catalog.popularity.tolist() == [pytest.approx(9.8), 0.0]
+    assert catalog.runtime.tolist() == [148.0, 0.0]
+    assert catalog.vote_count.tolist() == [20000, 0]
+    assert catalog.vote_average.tolist() == [pytest.approx(8.8), 0.0]
+
+
+def test_readers_load_identical_catalogs(tmp_path, monkeypatch):
+    """Test that the pyarrow and pandas readers produce exactly the same catalog."""
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "movies.csv"
+    csv_path.write_text(
+        "original_title,genres,keywords,production_companies,popularity,release_date,runtime,cast,vote_count,vote_average\n"
+        "Inception,Action|Adventure,Dream|Spy,Warner Bros,9.8,2010-07-16,148,Leonardo DiCaprio,20000,8.8\n"
+        "None,NA,null,,nan,,NULL,<NA>,n/a,\n"
+    )
+    pyarrow_catalog = DatabaseInterface(data_source=str(csv_path)).load_catalog()
+    monkeypatch.setattr(main, "pyarrow", None)
+    pandas_catalog = DatabaseInterface(data_source=str(csv_path)).load_catalog()
+
+    for field in dataclasses.fields(pandas_catalog):
+        pyarrow_column = getattr(pyarrow_catalog, field.name)
+        pandas_column = getattr(pandas_catalog, field.name)
+        assert pyarrow_column.dtype == pandas_column.dtype
+        assert pyarrow_column.tolist() == pandas_column.tolist()
+
+
+def test_clean_text_column_matches_clean_text():
+    column = pd.Series(["  Action |  Drama\t", None, "Sci-Fi", float("nan"), "", "Tom\xa0Hanks\x0b"])
+
+    cleaned = clean_text_column(column)
+    assert isinstance(cleaned, np.ndarray) and cleaned.dtype == object
+    assert cleaned.tolist() == [clean_text(text) for text in column]
@@ -1,4 +1,4 @@
-from main import Movie
+from main import Movie, MovieCatalog
 
 import pytest
 import pandas as pd 
@@ -31,4 +31,30 @@ def test_movie_invalid_date():
             companies="Test Company", popularity=5.0, 
             release_date="invalid_date", runtime=120, cast="Actor", 
             vote_count=100, vote_average=7.5
-        )
\ No newline at end of file
+        )
+
+
+def test_movie_with_parsed_release_date():
+    release_date = pd.Timestamp("2010-07-16")
+    movie = Movie(
+        title="Inception", genres="Action|Adventure", keywords="Dream|Spy",
+        companies="Warner Bros", popularity=9.8, release_date=release_date,
+        runtime=148, cast="Leonardo DiCaprio", vote_count=20000, vote_average=8.8,
+        release_year=2010
+    )
+
+    assert movie.release_date == release_date
+    assert movie.release_year == 2010
+
+
+def test_movie_catalog_from_movies():
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7)
+    ]
+    catalog = MovieCatalog.from_movies(movies)
+
+    assert len(catalog) == 2
+    assert list(catalog.titles) == ["Inception", "The Matrix"]
+    assert list(catalog.release_year) == [2010, 1999]
+    assert list(catalog.vote_count) == [20000, 15000]
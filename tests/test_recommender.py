@@ -1,5 +1,12 @@
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
 import pytest
-from main import Movie, MovieRecommender
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import MinMaxScaler, normalize
+import main
+from main import Config, DatabaseInterface, Movie, MovieRecommender, min_max_scale, top_k_indices
 
 
 def test_feature_engineering():
@@ -14,6 +21,27 @@ def test_feature_engineering():
     assert recommender.feature_matrix.shape[0] == 2  # Should be 2 rows (for 2 movies)
 
 
+def test_text_features_match_separate_fits():
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|The|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future|action", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family|drama", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando|Al Pacino", 12000, 9.2)
+    ]
+    recommender = MovieRecommender(movies)
+    recommender.feature_engineering()
+
+    expected = sparse.hstack([
+        TfidfVectorizer(tokenizer=lambda x: x.split('|'), stop_words='english', token_pattern=None).fit_transform(
+            [getattr(movie, field) for movie in movies]
+        )
+        for field in ("genres", "keywords", "cast")
+    ]).toarray()
+    text_block = recommender.feature_matrix[:, :expected.shape[1]].toarray()
+    assert recommender.feature_matrix.shape[1] == expected.shape[1] + 5
+    # Whole rows are L2-normalized afterwards, which scales each text block by the same factor.
+    np.testing.assert_allclose(normalize(text_block), normalize(expected), rtol=1e-6, atol=1e-7)
+
+
 def test_calculate_similarity():
     movies = [
         Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
@@ -28,6 +56,106 @@ def test_calculate_similarity():
     assert "The Godfather" in recommendations
 
 
+def test_calculate_similarity_is_cached():
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2)
+    ]
+    recommender = MovieRecommender(movies)
+
+    first = recommender.calculate_similarity("Inception")
+    first.append("Mutated")
+    assert recommender.calculate_similarity("Inception") == first[:-1]
+    assert recommender._cached_similarity.cache_info().hits == 1
+
+
+def test_calculate_similarity_batch():
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2)
+    ]
+    recommender = MovieRecommender(movies)
+
+    recommendations = recommender.calculate_similarity_batch(["Inception", "The Godfather"])
+    assert recommendations == [
+        recommender.calculate_similarity("Inception"),
+        recommender.calculate_similarity("The Godfather"),
+    ]
+
+    with pytest.raises(ValueError):
+        recommender.calculate_similarity_batch(["Inception", "Nonexistent Movie"])
+
+
+def test_precompute_neighbors():
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2)
+    ]
+    recommender = MovieRecommender(movies)
+    expected = recommender.calculate_similarity("Inception")
+
+    recommender.precompute_neighbors(block_size=2)
+    assert recommender.neighbors.shape == (3, 2)
+    assert recommender.calculate_similarity("Inception") == expected
+
+
+@pytest.mark.parametrize("backend", ["sparse", "faiss"])
+def test_sparse_query_blocks_match_dense(monkeypatch, backend):
+    if backend == "faiss":
+        pytest.importorskip("faiss")
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2),
+        Movie("Heat", "Action|Crime", "Heist|Spy", "Warner Bros", 8.1, "1995-12-15", 170, "Al Pacino", 9000, 8.3)
+    ]
+    recommender = MovieRecommender(movies, backend=backend)
+    expected = [recommender.calculate_similarity(movie.title) for movie in movies]
+
+    # Force every block, even single queries, onto the bounded-memory path.
+    monkeypatch.setattr(main, "DENSE_QUERY_MAX_VALUES", 0)
+    recommender.precompute_neighbors(block_size=3)
+    assert recommender.calculate_similarity_batch([movie.title for movie in movies]) == expected
+
+
+def test_faiss_backend_matches_sparse():
+    pytest.importorskip("faiss")
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2)
+    ]
+    sparse_recommender = MovieRecommender(movies, backend="sparse")
+    faiss_recommender = MovieRecommender(movies, backend="faiss")
+
+    assert faiss_recommender.calculate_similarity("Inception") == sparse_recommender.calculate_similarity("Inception")
+    assert faiss_recommender.index is not None
+
+
+def test_cupy_backend_matches_sparse(monkeypatch):
+    # Host arrays stand in for the GPU, so the CuPy code path runs without one.
+    monkeypatch.setattr(main, "cp", SimpleNamespace(asarray=lambda x: x, asnumpy=lambda x: x))
+    monkeypatch.setattr(main, "cp_sparse", SimpleNamespace(csr_matrix=sparse.csr_matrix))
+    monkeypatch.setattr(Config, "GPU_MIN_MOVIES", 0)
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2)
+    ]
+    titles = [movie.title for movie in movies]
+    sparse_recommender = MovieRecommender(movies, backend="sparse")
+    cupy_recommender = MovieRecommender(movies, backend="cupy")
+
+    assert cupy_recommender.calculate_similarity_batch(titles) == sparse_recommender.calculate_similarity_batch(titles)
+    assert cupy_recommender.feature_matrix_gpu is not None
+
+    monkeypatch.setattr(main, "DENSE_QUERY_MAX_VALUES", 0)
+    assert cupy_recommender._nearest_neighbors(np.arange(3)).tolist() == sparse_recommender._nearest_neighbors(np.arange(3)).tolist()
+
+
 def test_movie_not_found():
     movies = [
         Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
@@ -36,3 +164,88 @@ def test_movie_not_found():
 
     with pytest.raises(ValueError):
         recommender.calculate_similarity("Nonexistent Movie")
+
+
+def test_feature_cache_round_trip(tmp_path):
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 175, "Marlon Brando", 12000, 9.2)
+    ]
+    recommender = MovieRecommender(movies)
+    cache_path = str(tmp_path / "features.npz")
+    recommender.save_features(cache_path, "key")
+
+    cached = MovieRecommender.load_features(cache_path, "key")
+    assert cached is not None
+    assert (cached.feature_matrix != recommender.feature_matrix).nnz == 0
+    assert cached.calculate_similarity("Inception") == recommender.calculate_similarity("Inception")
+
+    assert MovieRecommender.load_features(cache_path, "other key") is None
+
+
+def test_feature_cache_write_failure_leaves_no_files(tmp_path, monkeypatch):
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 136, "Keanu Reeves", 15000, 8.7)
+    ]
+    recommender = MovieRecommender(movies)
+
+    def failing_savez(f, **arrays):
+        f.write(b"partial")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(np, "savez", failing_savez)
+    recommender.save_features(str(tmp_path / "features.npz"), "key")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_feature_cache_keeps_missing_titles(tmp_path, csv_reader):
+    csv_path = tmp_path / "movies.csv"
+    pd.DataFrame({
+        "original_title": ["Inception", None, "The Godfather"],
+        "genres": ["Action|Adventure", "Action|Sci-Fi", "Crime|Drama"],
+        "keywords": ["Dream|Spy", "Hacker|Future", "Mafia|Family"],
+        "production_companies": ["Warner Bros", "Warner Bros", "Paramount Pictures"],
+        "popularity": [9.8, 9.5, 9.2],
+        "release_date": ["2010-07-16", "1999-03-31", "1972-03-24"],
+        "runtime": [148, 136, 175],
+        "cast": ["Leonardo DiCaprio", "Keanu Reeves", "Marlon Brando"],
+        "vote_count": [20000, 15000, 12000],
+        "vote_average": [8.8, 8.7, 9.2],
+    }).to_csv(csv_path, index=False)
+    recommender = MovieRecommender(DatabaseInterface(data_source=str(csv_path)).load_catalog())
+    cache_path = str(tmp_path / "features.npz")
+    recommender.save_features(cache_path, "key")
+
+    cached = MovieRecommender.load_features(cache_path, "key")
+    assert list(cached.movies.titles) == list(recommender.movies.titles) == ["Inception", "", "The Godfather"]
+    assert cached.calculate_similarity("Inception") == recommender.calculate_similarity("Inception")
+    for model in (recommender, cached):
+        with pytest.raises(ValueError):
+            model.calculate_similarity("nan")
+
+
+def test_top_k_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+    assert top_k_indices(scores, 0).tolist() == []
+    assert top_k_indices(np.vstack([scores, -scores]), 2).tolist() == [[1, 3], [0, 4]]
+
+
+def test_min_max_scale_matches_min_max_scaler():
+    movies = [
+        Movie("Inception", "Action|Adventure", "Dream|Spy", "Warner Bros", 9.8, "2010-07-16", 148, "Leonardo DiCaprio", 20000, 8.8),
+        Movie("The Matrix", "Action|Sci-Fi", "Hacker|Future", "Warner Bros", 9.5, "1999-03-31", 148, "Keanu Reeves", 15000, 8.7),
+        Movie("The Godfather", "Crime|Drama", "Mafia|Family", "Paramount Pictures", 9.2, "1972-03-24", 148, "Marlon Brando", 12000, 9.2)
+    ]
+    continuous_features = MovieRecommender(movies)._continuous_features(2024)
+    expected = MinMaxScaler().fit_transform(continuous_features.astype(np.float64))
+
+    scaled = min_max_scale(continuous_features)
+    assert scaled is continuous_features
+    assert scaled.dtype == np.float32
+    np.testing.assert_allclose(scaled, expected, rtol=1e-6, atol=1e-6)
+    assert (scaled[:, 1] == 0).all()  # Equal runtimes give a constant column